@@ -12,6 +12,7 @@ from tools.tool_registry import registry
 from agents.base_agent import BaseAgent
 from agents.prompt_templates import get_react_prompt, format_tool_description
 from utils.logger import log
+from utils.json_fast import extract_json_object
 
 
 class ReActAgent(BaseAgent):
@@ -31,6 +32,12 @@ class ReActAgent(BaseAgent):
     def discover_tools(self) -> List[Dict[str, Any]]:
         return registry.list_tools()
 
+    def format_tools_for_prompt(self, tools: List[Dict]) -> str:
+        # 只有传入的正是注册表全集时才复用缓存的描述；被过滤/改写过的列表照常现拼
+        if tools == registry.list_tools():
+            return registry.tools_description_cached()
+        return format_tool_description(tools)
+
     def build_messages(
         self, task: str, tools_description: str, history_text: str
     ) -> Tuple[List[Dict], Dict[str, Any]]:
@@ -76,9 +83,9 @@ class ReActAgent(BaseAgent):
 
         # JSON 解析
         try:
-            json_match = re.search(r"({.*})", action_text, re.DOTALL)
-            if json_match:
-                action_json = json.loads(json_match.group(1))
+            json_text = extract_json_object(action_text)
+            if json_text:
+                action_json = json.loads(json_text)
                 if isinstance(action_json, dict):
                     if "name" in action_json and "args" in action_json:
                         action_dict = {
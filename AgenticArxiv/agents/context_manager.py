@@ -1,52 +1,71 @@
 # AgenticArxiv/agents/context_manager.py
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Deque, Iterator
+from collections import deque
+from dataclasses import dataclass, field
 import json
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ReactStep:
     """ReAct的每一步"""
     thought: str
     action: str
     observation: str
+    # 构造时格式化一次，format() 直接复用
+    _formatted: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self,
+            "_formatted",
+            f"Thought: {self.thought}\nAction: {self.action}\nObservation: {self.observation}",
+        )
     
     def format(self) -> str:
         """格式化为文本"""
-        return f"""Thought: {self.thought}
-Action: {self.action}
-Observation: {self.observation}"""
+        return self._formatted
 
 class ContextManager:
     """管理Agent的上下文历史"""
     
     def __init__(self, max_steps: int = 10):
-        self.history: List[ReactStep] = []
+        # 超过 max_steps 时 deque 自动从左侧淘汰最早的步骤
+        self.history: Deque[ReactStep] = deque(maxlen=max_steps)
         self.max_steps = max_steps
+        # 与 history 一一对应的已格式化文本，避免每轮重新 format 全部历史
+        self._rendered: Deque[str] = deque(maxlen=max_steps)
+        self._rendered_str: Optional[str] = None
         
     def add_step(self, thought: str, action: str, observation: str):
         """添加一个ReAct步骤"""
         step = ReactStep(thought, action, observation)
         self.history.append(step)
-        
-        # 如果超过最大步数，移除最早的一步
-        if len(self.history) > self.max_steps:
-            self.history = self.history[-self.max_steps:]
+        self._rendered.append(step.format())
+        self._rendered_str = None
     
     def get_history_text(self) -> str:
         """获取历史记录的文本表示"""
-        return "\n\n".join([step.format() for step in self.history])
+        if self._rendered_str is None:
+            self._rendered_str = "\n\n".join(self._rendered)
+        return self._rendered_str
     
-    def get_full_history(self) -> List[Dict[str, str]]:
-        """获取完整的历史记录"""
-        return [
-            {
+    def iter_full_history(self) -> Iterator[Dict[str, str]]:
+        """逐条生成历史记录，按需构造 dict"""
+        for step in self.history:
+            yield {
                 "thought": step.thought,
                 "action": step.action,
                 "observation": step.observation
             }
-            for step in self.history
-        ]
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return self.iter_full_history()
+    
+    def get_full_history(self) -> List[Dict[str, str]]:
+        """获取完整的历史记录"""
+        return list(self.iter_full_history())
     
     def clear(self):
         """清空历史记录"""
-        self.history.clear()
\ No newline at end of file
+        self.history.clear()
+        self._rendered.clear()
+        self._rendered_str = None
\ No newline at end of file
@@ -32,13 +32,19 @@ Action: {{"name":"download_arxiv_pdf","args":{{"ref":null,"session_id":"demo1","
 {history}
 """
 
+# 模板固定不变：加载时用占位符渲染一次（同时处理掉 {{ }} 转义），切成静态片段，
+# 每轮只需按顺序拼接，省去 str.format 的模板解析
+_TOOLS_HOLE, _TASK_HOLE, _HISTORY_HOLE = "\x00tools\x00", "\x00task\x00", "\x00history\x00"
+_SEG0, _rest = REACT_PROMPT_TEMPLATE.format(
+    tools_description=_TOOLS_HOLE, task=_TASK_HOLE, history=_HISTORY_HOLE
+).split(_TOOLS_HOLE)
+_SEG1, _rest = _rest.split(_TASK_HOLE)
+_SEG2, _SEG3 = _rest.split(_HISTORY_HOLE)
+del _rest
+
 def get_react_prompt(task: str, tools_description: str, history: str = "") -> str:
     """生成ReAct提示词"""
-    return REACT_PROMPT_TEMPLATE.format(
-        task=task,
-        tools_description=tools_description,
-        history=history
-    )
+    return "".join((_SEG0, tools_description, _SEG1, task, _SEG2, history, _SEG3))
 
 def format_tool_description(tools) -> str:
     """格式化工具描述 - 更详细的版本"""
@@ -18,6 +18,7 @@ from models.schemas import (
 )
 from models.store import store
 from utils.logger import log
+from utils.pdf_downloader import lock_is_held
 
 from services.runtime import event_bus, translate_runner
 from services.log_service import log_service
@@ -628,19 +629,17 @@ def delete_pdf_asset(
         )
 
     local_path = asset.local_path
+    # .part / .part.meta 是中断下载留下的续传文件及其校验值；.lock 为旧版本可能遗留的锁文件，一并清理
     lock_path = (local_path or "") + ".lock"
     part_path = (local_path or "") + ".part"
-
-    if lock_path and os.path.exists(lock_path):
-        raise HTTPException(
-            status_code=409, detail="检测到锁文件，可能仍在下载/处理中，暂不可删除"
-        )
+    part_meta_path = part_path + ".meta"
 
     deleted_files: List[str] = []
     warnings: List[str] = []
 
     _safe_remove_file(local_path, settings.pdf_raw_path, deleted_files, warnings)
     _safe_remove_file(part_path, settings.pdf_raw_path, deleted_files, warnings)
+    _safe_remove_file(part_meta_path, settings.pdf_raw_path, deleted_files, warnings)
     _safe_remove_file(lock_path, settings.pdf_raw_path, deleted_files, warnings)
 
     removed_cache = store.delete_pdf_asset(paper_id)
@@ -689,9 +688,10 @@ def delete_translate_asset(
     mono_lock = (mono_path or "") + ".lock"
     log_path = os.path.join(settings.pdf_translated_log_path, f"{paper_id}.pdf2zh.log")
 
-    if mono_lock and os.path.exists(mono_lock):
+    # 锁文件在释放后会保留，需探测锁是否真的被占用
+    if mono_lock and lock_is_held(mono_lock):
         raise HTTPException(
-            status_code=409, detail="检测到锁文件，可能仍在翻译/处理中，暂不可删除"
+            status_code=409, detail="翻译锁被占用，可能仍在翻译/处理中，暂不可删除"
         )
 
     deleted_files: List[str] = []
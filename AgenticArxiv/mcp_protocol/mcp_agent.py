@@ -22,6 +22,7 @@ from agents.base_agent import BaseAgent
 from agents.prompt_templates import get_react_prompt, format_tool_description
 from utils.llm_client import LLMClient
 from utils.logger import log
+from utils.json_fast import extract_json_object
 
 
 MCP_SERVER_MODULE = "mcp_protocol.server"
@@ -181,9 +182,9 @@ class MCPAgent(BaseAgent):
             return thought, None
 
         try:
-            json_match = re.search(r"({.*})", action_text, re.DOTALL)
-            if json_match:
-                action_json = json.loads(json_match.group(1))
+            json_text = extract_json_object(action_text)
+            if json_text:
+                action_json = json.loads(json_text)
                 if isinstance(action_json, dict):
                     if "name" in action_json and "args" in action_json:
                         return thought, {"name": action_json["name"], "args": action_json["args"]}
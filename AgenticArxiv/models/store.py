@@ -1,14 +1,16 @@
 # AgenticArxiv/models/store.py
 from __future__ import annotations
 
-import json
+import itertools
 import os
 import re
-import uuid
+import secrets
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
-from sqlalchemy import func
+from sqlalchemy import func, or_
 
 from config import settings
 from models.db import get_sync_session
@@ -18,12 +20,27 @@ from models.orm import (
 from models.schemas import (
     Paper, PdfAsset, TranslateAsset, TranslateTask,
 )
+from utils import json_fast
+from utils.logger import log
 
 _REF_RE = re.compile(r"(?:第)?\s*(\d+)\s*(?:篇)?")
 
+# 本进程内已确认存在的目录，重复构造 Store（测试、worker）时不再 mkdir
+_DIRS_ENSURED: set[str] = set()
+
+
+def _ensure_dir(path: str) -> None:
+    if path in _DIRS_ENSURED:
+        return
+    os.makedirs(path, exist_ok=True)
+    _DIRS_ENSURED.add(path)
+
+
+# 以下 row -> schema 转换的数据都来自我们自己写入的表，字段类型已确定，
+# 用 model_construct 跳过 pydantic 的逐字段校验
 
 def _pdf_row_to_schema(row: PdfAssetRow) -> PdfAsset:
-    return PdfAsset(
+    return PdfAsset.model_construct(
         paper_id=row.paper_id,
         pdf_url=row.pdf_url or "",
         local_path=row.local_path or "",
@@ -37,7 +54,7 @@ def _pdf_row_to_schema(row: PdfAssetRow) -> PdfAsset:
 
 
 def _translate_row_to_schema(row: TranslateAssetRow) -> TranslateAsset:
-    return TranslateAsset(
+    return TranslateAsset.model_construct(
         paper_id=row.paper_id,
         input_pdf_path=row.input_pdf_path or "",
         output_mono_path=row.output_mono_path or "",
@@ -55,10 +72,10 @@ def _task_row_to_schema(row: TranslateTaskRow) -> TranslateTask:
     meta = {}
     if row.meta:
         try:
-            meta = json.loads(row.meta)
+            meta = json_fast.loads(row.meta)
         except Exception:
             pass
-    return TranslateTask(
+    return TranslateTask.model_construct(
         task_id=row.task_id,
         session_id=row.session_id,
         paper_id=row.paper_id,
@@ -79,12 +96,13 @@ def _paper_row_to_schema(row: SessionPaperRow) -> Paper:
         if not s:
             return []
         try:
-            return json.loads(s)
+            return json_fast.loads(s)
         except Exception:
             return []
 
-    return Paper(
-        id=row.paper_id,
+    return Paper.model_construct(
+        # 同一篇论文会在多个会话/多次查询中反复加载，intern 后共享同一个 id 对象
+        id=sys.intern(row.paper_id),
         title=row.title or "",
         authors=_load_json_list(row.authors),
         summary=row.summary,
@@ -101,17 +119,62 @@ def _paper_row_to_schema(row: SessionPaperRow) -> Paper:
 class Store:
     """MySQL-backed store (synchronous, thread-safe via SQLAlchemy connection pool)."""
 
-    def __init__(self, ttl_minutes: int = 60, max_papers: int = 50):
+    def __init__(
+        self,
+        ttl_minutes: int = 60,
+        max_papers: int = 50,
+        purge_interval_s: float = 300.0,
+    ):
         self.ttl = timedelta(minutes=ttl_minutes)
         self.max_papers = max_papers
+        # 过期会话的顺带清理：写路径上最多每 purge_interval_s 秒执行一次
+        self.purge_interval_s = purge_interval_s
+        self._last_purge_mono = 0.0
+        # task_id = 进程随机前缀 + 自增计数：进程内唯一，跨进程/重启靠随机前缀区分
+        self._task_prefix = secrets.token_hex(6)
+        self._task_counter = itertools.count()
 
         # Ensure output directories exist
-        os.makedirs(settings.pdf_raw_path, exist_ok=True)
-        os.makedirs(settings.pdf_translated_path, exist_ok=True)
+        _ensure_dir(settings.pdf_raw_path)
+        _ensure_dir(settings.pdf_translated_path)
+
+    def _expired(self, ts: Optional[datetime]) -> bool:
+        """ts 为空视为未过期"""
+        return ts is not None and (datetime.now() - ts) > self.ttl
 
     # -------- session memory --------
 
+    def purge_expired_sessions(self) -> int:
+        """
+        删除超过 TTL 的会话及其论文列表，返回删除的会话数。
+        过期会话本来就读不到（get_last_papers 返回 []，last_active 视为 None），
+        删除只是避免 sessions / session_papers 表随历史会话数无限增长。
+        """
+        cutoff = datetime.now() - self.ttl
+        with get_sync_session() as db:
+            # 两条 DELETE 都带上 cutoff 条件：期间被 set_last_papers 刷新过的会话不会被误删
+            still_expired = db.query(SessionRow.session_id).filter(SessionRow.updated_at < cutoff)
+            db.query(SessionPaperRow).filter(
+                SessionPaperRow.session_id.in_(still_expired.scalar_subquery())
+            ).delete(synchronize_session=False)
+            n = db.query(SessionRow).filter(
+                SessionRow.updated_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            return n
+
+    def _maybe_purge_expired_sessions(self) -> None:
+        now = time.monotonic()
+        if now - self._last_purge_mono < self.purge_interval_s:
+            return
+        self._last_purge_mono = now
+        try:
+            self.purge_expired_sessions()
+        except Exception as e:
+            log.warning(f"清理过期会话失败: {e}")
+
     def set_last_papers(self, session_id: str, papers: List[Paper]) -> None:
+        self._maybe_purge_expired_sessions()
         with get_sync_session() as db:
             # Ensure session row exists
             row = db.query(SessionRow).filter_by(session_id=session_id).first()
@@ -127,15 +190,15 @@ class Store:
                     session_id=session_id,
                     paper_id=p.id,
                     title=p.title,
-                    authors=json.dumps(p.authors, ensure_ascii=False),
+                    authors=json_fast.dumps(p.authors),
                     summary=p.summary,
                     published=p.published,
                     updated=p.updated,
                     pdf_url=p.pdf_url,
                     primary_category=p.primary_category,
-                    categories=json.dumps(p.categories, ensure_ascii=False),
+                    categories=json_fast.dumps(p.categories),
                     comment=p.comment,
-                    links=json.dumps(p.links, ensure_ascii=False),
+                    links=json_fast.dumps(p.links),
                     position=i,
                 ))
             db.commit()
@@ -145,7 +208,7 @@ class Store:
             row = db.query(SessionRow).filter_by(session_id=session_id).first()
             if not row:
                 return []
-            if row.updated_at and (datetime.now() - row.updated_at) > self.ttl:
+            if self._expired(row.updated_at):
                 return []
             paper_rows = (
                 db.query(SessionPaperRow)
@@ -165,9 +228,10 @@ class Store:
             if not row:
                 row = SessionRow(session_id=session_id)
                 db.add(row)
+            now = datetime.now()
             row.last_active_paper_id = paper_id
-            row.last_active_at = datetime.now()
-            row.updated_at = datetime.now()
+            row.last_active_at = now
+            row.updated_at = now
             db.commit()
 
     def get_last_active_paper_id(self, session_id: str) -> Optional[str]:
@@ -175,48 +239,74 @@ class Store:
             row = db.query(SessionRow).filter_by(session_id=session_id).first()
             if not row:
                 return None
-            if row.last_active_at and (datetime.now() - row.last_active_at) > self.ttl:
+            if self._expired(row.last_active_at):
                 row.last_active_paper_id = None
                 row.last_active_at = None
                 db.commit()
                 return None
             return row.last_active_paper_id
 
-    def resolve_paper(
-        self, session_id: str, ref: Union[str, int, None]
+    def _find_session_paper(
+        self, session_id: str, *criteria, prefer=None, **filters
     ) -> Optional[Paper]:
-        papers = self.get_last_papers(session_id)
-        if not papers:
+        """
+        按 session_id + 额外条件（paper_id / position / 标题表达式）直接查一行，
+        避免加载整个论文列表再线性扫描；prefer 为真的行排在前面，其余按 position
+        """
+        with get_sync_session() as db:
+            row = db.query(SessionRow).filter_by(session_id=session_id).first()
+            if not row:
+                return None
+            if self._expired(row.updated_at):
+                return None
+            paper_row = (
+                db.query(SessionPaperRow)
+                .filter_by(session_id=session_id, **filters)
+                .filter(*criteria)
+                .order_by(
+                    *(() if prefer is None else (prefer.desc(),)),
+                    SessionPaperRow.position,
+                )
+                .first()
+            )
+            return _paper_row_to_schema(paper_row) if paper_row else None
+
+    def _paper_at(self, session_id: str, ref_no: int) -> Optional[Paper]:
+        """1-based 序号 -> 论文（set_last_papers 写入的 position 从 0 连续编号）"""
+        if ref_no < 1:
             return None
+        return self._find_session_paper(session_id, position=ref_no - 1)
 
+    def resolve_paper(
+        self, session_id: str, ref: Union[str, int, None]
+    ) -> Optional[Paper]:
         if ref is None:
             last_id = self.get_last_active_paper_id(session_id)
             if not last_id:
                 return None
-            for p in papers:
-                if p.id == last_id:
-                    return p
-            return None
+            return self._find_session_paper(session_id, paper_id=last_id)
 
         if isinstance(ref, int):
-            idx = ref - 1
-            return papers[idx] if 0 <= idx < len(papers) else None
+            return self._paper_at(session_id, ref)
 
         s = str(ref).strip()
+        # 最常见的是纯数字序号，直接 int()，不走正则
+        if s.isdecimal():
+            return self._paper_at(session_id, int(s))
         m = _REF_RE.fullmatch(s)
         if m:
-            idx = int(m.group(1)) - 1
-            return papers[idx] if 0 <= idx < len(papers) else None
-
-        for p in papers:
-            if p.id == s:
-                return p
-
-        low = s.lower()
-        for p in papers:
-            if low in (p.title or "").lower():
-                return p
-        return None
+            return self._paper_at(session_id, int(m.group(1)))
+
+        # 标题模糊匹配交给数据库，不再为每篇论文构造 Paper 并重复 lower()
+        title_match = func.lower(SessionPaperRow.title).contains(s.lower(), autoescape=True)
+        # arXiv id 不含空白；单个词的 ref 可能是 id 也可能是标题片段，
+        # 合成一条查询：id 精确匹配优先，其次按 position 取第一条标题匹配
+        if len(s.split()) == 1:
+            id_match = SessionPaperRow.paper_id == s
+            return self._find_session_paper(
+                session_id, or_(id_match, title_match), prefer=id_match
+            )
+        return self._find_session_paper(session_id, title_match)
 
     # -------- PDF cache --------
 
@@ -240,7 +330,6 @@ class Store:
             row.updated_at = datetime.now()
             row.error = asset.error
             db.commit()
-            db.refresh(row)
             return _pdf_row_to_schema(row)
 
     def update_pdf_asset(self, paper_id: str, **kwargs) -> Optional[PdfAsset]:
@@ -253,7 +342,6 @@ class Store:
                     setattr(row, k, v)
             row.updated_at = datetime.now()
             db.commit()
-            db.refresh(row)
             return _pdf_row_to_schema(row)
 
     def delete_pdf_asset(self, paper_id: str) -> bool:
@@ -293,7 +381,6 @@ class Store:
             row.updated_at = datetime.now()
             row.error = asset.error
             db.commit()
-            db.refresh(row)
             return _translate_row_to_schema(row)
 
     def update_translate_asset(self, paper_id: str, **kwargs) -> Optional[TranslateAsset]:
@@ -306,7 +393,6 @@ class Store:
                     setattr(row, k, v)
             row.updated_at = datetime.now()
             db.commit()
-            db.refresh(row)
             return _translate_row_to_schema(row)
 
     def delete_translate_asset(self, paper_id: str) -> bool:
@@ -323,6 +409,20 @@ class Store:
             rows = db.query(TranslateAssetRow).order_by(TranslateAssetRow.updated_at.desc()).all()
             return [_translate_row_to_schema(r) for r in rows]
 
+    def get_cache_status(self, paper_id: str) -> Dict[str, Any]:
+        """在同一个 DB session 里读取 PDF / 翻译两条缓存记录，供缓存状态查询使用"""
+        with get_sync_session() as db:
+            pdf_row = db.query(PdfAssetRow).filter_by(paper_id=paper_id).first()
+            tr_row = db.query(TranslateAssetRow).filter_by(paper_id=paper_id).first()
+            pdf = _pdf_row_to_schema(pdf_row) if pdf_row else None
+            tr = _translate_row_to_schema(tr_row) if tr_row else None
+        return {
+            "pdf": (pdf.model_dump() if pdf else None),
+            "translate": (tr.model_dump() if tr else None),
+            "pdf_ready": bool(pdf and pdf.status == "READY"),
+            "translated_ready": bool(tr and tr.status == "READY"),
+        }
+
     # -------- tasks --------
 
     def create_translate_task(
@@ -332,7 +432,8 @@ class Store:
         input_pdf_url: Optional[str] = None,
         meta: Optional[Dict[str, str]] = None,
     ) -> TranslateTask:
-        task_id = uuid.uuid4().hex
+        # itertools.count 的 next() 在 CPython 下是原子的，无需额外加锁
+        task_id = f"{self._task_prefix}{next(self._task_counter):08x}"
         now = datetime.now()
         with get_sync_session() as db:
             row = TranslateTaskRow(
@@ -341,13 +442,12 @@ class Store:
                 paper_id=paper_id,
                 status="PENDING",
                 input_pdf_url=input_pdf_url,
-                meta=json.dumps(meta or {}, ensure_ascii=False),
+                meta=json_fast.dumps(meta or {}),
                 created_at=now,
                 updated_at=now,
             )
             db.add(row)
             db.commit()
-            db.refresh(row)
             return _task_row_to_schema(row)
 
     def get_task(self, task_id: str) -> Optional[TranslateTask]:
@@ -362,12 +462,11 @@ class Store:
                 return None
             for k, v in kwargs.items():
                 if k == "meta" and isinstance(v, dict):
-                    row.meta = json.dumps(v, ensure_ascii=False)
+                    row.meta = json_fast.dumps(v)
                 elif hasattr(row, k):
                     setattr(row, k, v)
             row.updated_at = datetime.now()
             db.commit()
-            db.refresh(row)
             return _task_row_to_schema(row)
 
     def list_tasks(
@@ -384,17 +483,18 @@ class Store:
 
     def validate_local_paths(self) -> None:
         """Mark READY assets as FAILED if their local files are missing."""
+        now = datetime.now()
         with get_sync_session() as db:
             for row in db.query(PdfAssetRow).filter_by(status="READY").all():
                 if not row.local_path or not os.path.exists(row.local_path):
                     row.status = "FAILED"
                     row.error = f"local file missing: {row.local_path}"
-                    row.updated_at = datetime.now()
+                    row.updated_at = now
             for row in db.query(TranslateAssetRow).filter_by(status="READY").all():
                 if not row.output_mono_path or not os.path.exists(row.output_mono_path):
                     row.status = "FAILED"
                     row.error = f"local file missing: {row.output_mono_path}"
-                    row.updated_at = datetime.now()
+                    row.updated_at = now
             db.commit()
 
 
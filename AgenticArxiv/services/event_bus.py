@@ -1,7 +1,6 @@
 # AgenticArxiv/services/event_bus.py
 from __future__ import annotations
 
-import json
 import queue
 import threading
 import uuid
@@ -9,16 +8,20 @@ from typing import Dict, Tuple, Any
 
 from fastapi.encoders import jsonable_encoder
 
+from utils import json_fast
+
 
 class EventBus:
     """
     进程内事件总线（MVP）
     - session_id 维度订阅
     - 每个订阅一个 thread-safe Queue，用于 SSE StreamingResponse 读取
+    - 订阅表 copy-on-write：subscribe/unsubscribe 在锁内整体替换该 session 的订阅 dict，
+      publish 只读取当前快照，不加锁，不同 session 的推送互不阻塞
     """
 
     def __init__(self) -> None:
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._subs: Dict[str, Dict[str, "queue.Queue[str]"]] = {}
 
     def subscribe(self, session_id: str) -> Tuple[str, "queue.Queue[str]"]:
@@ -26,17 +29,21 @@ class EventBus:
         sub_id = uuid.uuid4().hex
         q: "queue.Queue[str]" = queue.Queue()
         with self._lock:
-            self._subs.setdefault(sid, {})[sub_id] = q
+            m = dict(self._subs.get(sid, {}))
+            m[sub_id] = q
+            self._subs[sid] = m
         return sub_id, q
 
     def unsubscribe(self, session_id: str, sub_id: str) -> None:
         sid = session_id or "default"
         with self._lock:
             m = self._subs.get(sid)
-            if not m:
+            if not m or sub_id not in m:
                 return
-            m.pop(sub_id, None)
-            if not m:
+            m = {k: v for k, v in m.items() if k != sub_id}
+            if m:
+                self._subs[sid] = m
+            else:
                 self._subs.pop(sid, None)
 
     def publish(self, session_id: str, event: Dict[str, Any]) -> None:
@@ -45,24 +52,25 @@ class EventBus:
         """
         sid = session_id or "default"
 
+        # 快照 dict 只会被整体替换、不会原地修改，无需加锁；无订阅者时也省去序列化
+        subs = self._subs.get(sid)
+        if not subs:
+            return
+
         try:
             # 关键：把 datetime/BaseModel 等统统转成 JSON 友好结构
             safe_event = jsonable_encoder(event)
-            data = json.dumps(safe_event, ensure_ascii=False)
+            data = json_fast.dumps(safe_event)
         except Exception as e:
             # 注意：不要用 type="error"，避免前端把它当 SSE 故障
-            data = json.dumps(
+            data = json_fast.dumps(
                 {
                     "type": "event_bus_error",
                     "message": f"event serialization failed: {e}",
-                },
-                ensure_ascii=False,
+                }
             )
 
-        with self._lock:
-            subs = list(self._subs.get(sid, {}).values())
-
-        for q in subs:
+        for q in subs.values():
             try:
                 q.put_nowait(data)
             except Exception:
@@ -131,7 +131,7 @@ class TranslateRunner:
                     "fast_path": "true",
                 },
             )
-            store.update_task(
+            task_obj = store.update_task(
                 t.task_id,
                 status="SUCCEEDED",
                 progress=1.0,
@@ -139,8 +139,6 @@ class TranslateRunner:
                 output_pdf_path=asset.output_mono_path,
                 error=None,
             )
-
-            task_obj = store.get_task(t.task_id)
             self.event_bus.publish(
                 sid,
                 {"type": "task_created", "kind": "translate", "task": task_obj.model_dump()},
@@ -152,7 +150,7 @@ class TranslateRunner:
             return task_obj
 
         # 正常创建 PENDING
-        t = store.create_translate_task(
+        task_obj = store.create_translate_task(
             session_id=sid,
             paper_id=pid,
             input_pdf_url=purl,
@@ -163,8 +161,6 @@ class TranslateRunner:
                 "keep_dual": str(keep_dual).lower(),
             },
         )
-
-        task_obj = store.get_task(t.task_id)
         self.event_bus.publish(
             sid,
             {"type": "task_created", "kind": "translate", "task": task_obj.model_dump()},
@@ -173,7 +169,7 @@ class TranslateRunner:
         th = threading.Thread(
             target=self._run_task_thread,
             kwargs=dict(
-                task_id=t.task_id,
+                task_id=task_obj.task_id,
                 session_id=sid,
                 paper_id=pid,
                 pdf_url=purl,
@@ -186,7 +182,7 @@ class TranslateRunner:
             daemon=True,
         )
         with self._threads_lock:
-            self._threads[t.task_id] = th
+            self._threads[task_obj.task_id] = th
         th.start()
 
         return task_obj
@@ -235,8 +231,7 @@ class TranslateRunner:
             last_sent_t = now
 
             try:
-                store.update_task(task_id, status="RUNNING", progress=last_sent_p, error=None)
-                cur = store.get_task(task_id)
+                cur = store.update_task(task_id, status="RUNNING", progress=last_sent_p, error=None)
                 self.event_bus.publish(
                     sid,
                     {
@@ -250,8 +245,7 @@ class TranslateRunner:
                 return
 
         try:
-            store.update_task(task_id, status="RUNNING", progress=0.01, error=None)
-            started = store.get_task(task_id)
+            started = store.update_task(task_id, status="RUNNING", progress=0.01, error=None)
             self.event_bus.publish(
                 sid,
                 {"type": "task_started", "kind": "translate", "task": started.model_dump()},
@@ -273,7 +267,7 @@ class TranslateRunner:
                 progress_cb=publish_progress,
             )
 
-            store.update_task(
+            done = store.update_task(
                 task_id,
                 status="SUCCEEDED",
                 progress=1.0,
@@ -281,7 +275,6 @@ class TranslateRunner:
                 output_pdf_path=res.get("output_pdf_path"),
                 error=None,
             )
-            done = store.get_task(task_id)
             self.event_bus.publish(
                 sid,
                 {"type": "task_succeeded", "kind": "translate", "task": done.model_dump()},
@@ -289,8 +282,7 @@ class TranslateRunner:
 
         except Exception as e:
             log.error(f"Translate task failed: task_id={task_id}, err={e}")
-            store.update_task(task_id, status="FAILED", progress=1.0, error=str(e))
-            failed = store.get_task(task_id)
+            failed = store.update_task(task_id, status="FAILED", progress=1.0, error=str(e))
             self.event_bus.publish(
                 sid,
                 {"type": "task_failed", "kind": "translate", "task": failed.model_dump()},
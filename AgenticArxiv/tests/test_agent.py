@@ -9,7 +9,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import tools.arxiv_tool
 
 from tools.tool_registry import registry
-from agents.prompt_templates import format_tool_description
 
 def test_prompt_generation():
     """测试提示词生成"""
@@ -20,7 +19,7 @@ def test_prompt_generation():
     print(f"发现 {len(tools)} 个工具")
     
     # 生成工具描述
-    tools_description = format_tool_description(tools)
+    tools_description = registry.tools_description_cached()
     print("\n生成的工具描述:")
     print("-" * 50)
     print(tools_description)
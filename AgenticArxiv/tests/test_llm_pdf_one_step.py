@@ -2,8 +2,8 @@
 import os
 import sys
 import json
-import re
 import argparse
+from functools import lru_cache
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -12,6 +12,8 @@ import tools.pdf_download_tool  # noqa: F401
 import tools.pdf_translate_tool  # noqa: F401
 
 from tools.tool_registry import registry
+from utils import json_fast
+from utils.json_fast import extract_json_object
 from utils.llm_client import get_env_llm_client
 from config import settings
 
@@ -26,7 +28,7 @@ def build_single_step_prompt(task: str) -> str:
     tools_desc = []
     for t in tools:
         tools_desc.append(
-            f"- {t['name']}: {t['description']}\n  parameters: {json.dumps(t['parameters'], ensure_ascii=False)}"
+            f"- {t['name']}: {t['description']}\n  parameters: {json_fast.dumps(t['parameters'])}"
         )
 
     return f"""你是一个工具调用助手。你只能从下面工具中选择一个执行一次（单步），并输出严格 JSON：
@@ -41,12 +43,17 @@ def build_single_step_prompt(task: str) -> str:
 """
 
 
-def parse_action_json(llm_text: str) -> dict:
-    # 允许 LLM 输出里夹带一点文字，这里抓第一个 {...}
-    m = re.search(r"(\{.*\})", llm_text, re.DOTALL)
-    if not m:
+@lru_cache(maxsize=128)
+def _extract_action_text(llm_text: str) -> str:
+    # 允许 LLM 输出里夹带一点文字，这里抓第一个 {...}；相同输出重试时直接命中缓存
+    json_text = extract_json_object(llm_text)
+    if not json_text:
         raise ValueError(f"LLM输出无法解析为JSON: {llm_text[:200]}")
-    obj = json.loads(m.group(1))
+    return json_text
+
+
+def parse_action_json(llm_text: str) -> dict:
+    obj = json_fast.loads(_extract_action_text(llm_text))
     if not isinstance(obj, dict) or "name" not in obj or "args" not in obj:
         raise ValueError(f"LLM JSON格式不符合要求: {obj}")
     return obj
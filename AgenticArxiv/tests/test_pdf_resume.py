@@ -0,0 +1,95 @@
+# AgenticArxiv/tests/test_pdf_resume.py
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_downloader import download_pdf
+
+ETAG = '"resume-test"'
+
+
+def _make_handler(body: bytes, state: dict):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            state["requests"].append(dict(self.headers))
+            start = 0
+            rng = self.headers.get("Range")
+            if rng and self.headers.get("If-Range") == ETAG:
+                start = int(rng.split("=", 1)[1].rstrip("-"))
+            self.send_response(206 if start else 200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(body) - start))
+            if start:
+                self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+            self.end_headers()
+            cut = state.pop("cut_at", None)
+            if cut is None:
+                self.wfile.write(body[start:])
+                return
+            # 只发一部分就断开连接，模拟传输中途掉线
+            self.wfile.write(body[start:cut])
+            self.wfile.flush()
+            self.close_connection = True
+
+    return Handler
+
+
+def check_resume(size: int, cut_at: int) -> None:
+    """传输中断后应留下非空 .part 和 .part.meta，下次调用带 Range/If-Range 续传且哈希正确"""
+    body = b"%PDF-1.4\n" + os.urandom(size - 9)
+    state = {"requests": [], "cut_at": cut_at}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(body, state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/x.pdf"
+
+    with tempfile.TemporaryDirectory() as d:
+        dest = os.path.join(d, "x.pdf")
+        try:
+            try:
+                download_pdf(url, dest)
+            except Exception as e:
+                print(f"第一次下载按预期中断: {type(e).__name__}")
+            else:
+                raise AssertionError("第一次下载应当因连接中断而失败")
+
+            part = dest + ".part"
+            assert os.path.exists(part) and os.path.getsize(part) > 0, "中断后没有留下 .part"
+            assert os.path.exists(part + ".meta"), "中断后没有留下 .part.meta"
+            kept = os.path.getsize(part)
+            print(f"保留的 .part: {kept} / {cut_at} 字节")
+
+            n, sha = download_pdf(url, dest)
+            last = state["requests"][-1]
+            assert last.get("Range") == f"bytes={kept}-", f"续传请求没有带 Range: {last}"
+            assert last.get("If-Range") == ETAG, f"续传请求没有带 If-Range: {last}"
+            assert n == len(body) and sha == hashlib.sha256(body).hexdigest(), "续传结果哈希不一致"
+            with open(dest, "rb") as f:
+                assert f.read() == body
+            assert not os.path.exists(part) and not os.path.exists(part + ".meta")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def test_resume_small_pdf():
+    # 小于 4 MiB 的 PDF（arXiv 上最常见）中途断开也要能续传
+    check_resume(3 * 1000 * 1000, 1000 * 1000)
+
+
+def test_resume_large_pdf():
+    check_resume(12 * 1000 * 1000, 9 * 1000 * 1000)
+
+
+if __name__ == "__main__":
+    test_resume_small_pdf()
+    test_resume_large_pdf()
+    print("续传检查通过")
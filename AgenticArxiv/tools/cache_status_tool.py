@@ -32,16 +32,7 @@ def get_paper_cache_status(
     # 更新 last_active：查状态也算“操作”
     store.set_last_active_paper_id(session_id, paper_id)
 
-    pdf = store.get_pdf_asset(paper_id)
-    tr = store.get_translate_asset(paper_id)
-
-    return {
-        "paper_id": paper_id,
-        "pdf": (pdf.dict() if pdf else None),
-        "translate": (tr.dict() if tr else None),
-        "pdf_ready": bool(pdf and pdf.status == "READY"),
-        "translated_ready": bool(tr and tr.status == "READY"),
-    }
+    return {"paper_id": paper_id, **store.get_cache_status(paper_id)}
 
 
 SCHEMA = {
@@ -12,8 +12,7 @@ from models.schemas import PdfAsset
 from utils.pdf_downloader import (
     normalize_arxiv_pdf_url,
     safe_filename,
-    acquire_lock,
-    release_lock,
+    stat_or_none,
     download_pdf,
 )
 from config import settings
@@ -62,17 +61,18 @@ def download_arxiv_pdf(
     local_path = os.path.join(settings.pdf_raw_path, filename)
 
     # 1) 若已存在且不强制，直接返回 READY
-    existed = os.path.exists(local_path) and os.path.getsize(local_path) > 0
+    st = stat_or_none(local_path)
+    existed = st is not None and st.st_size > 0
     asset = store.get_pdf_asset(paper_id)
 
     if existed and not force:
         if asset is None:
-            asset = PdfAsset(
+            asset = PdfAsset.model_construct(
                 paper_id=paper_id,
                 pdf_url=pdf_url,
                 local_path=local_path,
                 status="READY",
-                size_bytes=os.path.getsize(local_path),
+                size_bytes=st.st_size,
                 downloaded_at=datetime.now(),
             )
             store.upsert_pdf_asset(asset)
@@ -84,7 +84,7 @@ def download_arxiv_pdf(
                     status="READY",
                     local_path=local_path,
                     pdf_url=pdf_url,
-                    size_bytes=os.path.getsize(local_path),
+                    size_bytes=st.st_size,
                     downloaded_at=asset.downloaded_at or datetime.now(),
                     error=None,
                 )
@@ -97,14 +97,11 @@ def download_arxiv_pdf(
             "existed": True,
         }
 
-    # 2) 需要下载：加锁避免并发重复下载
-    lock_path = local_path + ".lock"
-    acquire_lock(lock_path)
-
+    # 2) 需要下载：download_pdf 写随机临时文件再原子替换，并发下载同一篇也安全，不再加锁
     try:
         # 标记 DOWNLOADING
         if asset is None:
-            asset = PdfAsset(
+            asset = PdfAsset.model_construct(
                 paper_id=paper_id,
                 pdf_url=pdf_url,
                 local_path=local_path,
@@ -151,8 +148,6 @@ def download_arxiv_pdf(
     except Exception as e:
         store.update_pdf_asset(paper_id, status="FAILED", error=str(e))
         raise
-    finally:
-        release_lock(lock_path)
 
 
 PDF_DOWNLOAD_TOOL_SCHEMA = {
@@ -11,6 +11,7 @@ from models.schemas import PdfAsset, TranslateAsset
 from utils.pdf_downloader import (
     normalize_arxiv_pdf_url,
     safe_filename,
+    stat_or_none,
     acquire_lock,
     release_lock,
     download_pdf,
@@ -34,17 +35,18 @@ def _ensure_pdf_downloaded_by_id(
     url = normalize_arxiv_pdf_url(pdf_url or _fallback_pdf_url(paper_id))
     local_path = os.path.join(settings.pdf_raw_path, safe_filename(paper_id) + ".pdf")
 
-    existed = os.path.exists(local_path) and os.path.getsize(local_path) > 0
+    st = stat_or_none(local_path)
+    existed = st is not None and st.st_size > 0
     asset = store.get_pdf_asset(paper_id)
 
     if existed and not force:
         if asset is None:
-            asset = PdfAsset(
+            asset = PdfAsset.model_construct(
                 paper_id=paper_id,
                 pdf_url=url,
                 local_path=local_path,
                 status="READY",
-                size_bytes=os.path.getsize(local_path),
+                size_bytes=st.st_size,
                 downloaded_at=datetime.now(),
             )
             store.upsert_pdf_asset(asset)
@@ -54,18 +56,16 @@ def _ensure_pdf_downloaded_by_id(
                 status="READY",
                 local_path=local_path,
                 pdf_url=url,
-                size_bytes=os.path.getsize(local_path),
+                size_bytes=st.st_size,
                 downloaded_at=asset.downloaded_at or datetime.now(),
                 error=None,
             )
         return local_path
 
-    # 需要下载：加锁避免重复
-    lock_path = local_path + ".lock"
-    acquire_lock(lock_path)
+    # 需要下载：download_pdf 写随机临时文件再原子替换，并发下载同一篇也安全，不再加锁
     try:
         if asset is None:
-            asset = PdfAsset(
+            asset = PdfAsset.model_construct(
                 paper_id=paper_id,
                 pdf_url=url,
                 local_path=local_path,
@@ -99,8 +99,6 @@ def _ensure_pdf_downloaded_by_id(
     except Exception as e:
         store.update_pdf_asset(paper_id, status="FAILED", error=str(e))
         raise
-    finally:
-        release_lock(lock_path)
 
 
 def translate_arxiv_pdf(
@@ -185,13 +183,14 @@ def translate_arxiv_pdf(
     os.makedirs(settings.pdf_translated_log_path, exist_ok=True)
     log_path = os.path.join(settings.pdf_translated_log_path, f"{paper_id}.pdf2zh.log")
 
-    existed = os.path.exists(mono_path) and os.path.getsize(mono_path) > 0
+    mono_st = stat_or_none(mono_path)
+    existed = mono_st is not None and mono_st.st_size > 0
     asset = store.get_translate_asset(paper_id)
 
     # 3) 若已存在且不强制，直接返回（异步任务跳过：runner 已有 fast-path）
     if existed and not force and not progress_cb:
         if asset is None:
-            asset = TranslateAsset(
+            asset = TranslateAsset.model_construct(
                 paper_id=paper_id,
                 input_pdf_path=in_path,
                 output_mono_path=mono_path,
@@ -230,10 +229,10 @@ def translate_arxiv_pdf(
 
     # 4) 翻译：加锁避免并发重复翻译
     lock_path = mono_path + ".lock"
-    acquire_lock(lock_path)
+    lock_fd = acquire_lock(lock_path)
     try:
         if asset is None:
-            asset = TranslateAsset(
+            asset = TranslateAsset.model_construct(
                 paper_id=paper_id,
                 input_pdf_path=in_path,
                 output_mono_path=mono_path,
@@ -314,7 +313,7 @@ def translate_arxiv_pdf(
         store.update_translate_asset(paper_id, status="FAILED", error=str(e))
         raise
     finally:
-        release_lock(lock_path)
+        release_lock(lock_fd)
 
 
 PDF_TRANSLATE_TOOL_SCHEMA = {
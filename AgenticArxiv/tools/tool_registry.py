@@ -1,5 +1,5 @@
 # AgenticArxiv/tools/tool_registry.py
-from typing import Dict, Any, Callable, List, Optional
+from typing import Dict, Any, Callable, List, Optional, Tuple
 import sys
 import os
 
@@ -13,6 +13,9 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, Dict[str, Any]] = {}
+        # 每次注册自增，用于判断缓存的工具描述是否过期
+        self._rev = 0
+        self._description_cache: Optional[Tuple[int, str]] = None
 
     def register_tool(
         self,
@@ -36,6 +39,7 @@ class ToolRegistry:
             "parameters": parameter_schema,
             "func": func,
         }
+        self._rev += 1
 
     def get_tool(self, name: str) -> Optional[Dict[str, Any]]:
         """获取指定名称的工具"""
@@ -52,6 +56,23 @@ class ToolRegistry:
             for tool in self._tools.values()
         ]
 
+    def tools_description_cached(self) -> str:
+        """
+        返回 format_tool_description(list_tools()) 的结果，按注册版本号缓存
+
+        工具集在进程生命周期内基本不变，避免每次构造 prompt 都重新拼接描述文本
+        """
+        cached = self._description_cache
+        if cached is not None and cached[0] == self._rev:
+            return cached[1]
+
+        from agents.prompt_templates import format_tool_description
+
+        rev = self._rev
+        text = format_tool_description(self.list_tools())
+        self._description_cache = (rev, text)
+        return text
+
     def execute_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """
         执行指定工具
@@ -21,38 +21,51 @@ def save_papers_to_file(papers: List[Dict], output_path: str) -> None:
         # 确保输出目录存在
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+        sep_major = "=" * 80
+        sep_minor = "-" * 60
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        # 先在内存里拼好全部内容，最后一次性写入
+        parts: List[str] = [
+            f"{sep_major}\n",
+            "ArXiv 计算机科学论文列表\n",
+            f"生成时间: {generated_at}\n",
+            f"论文数量: {len(papers)}\n",
+            f"{sep_major}\n\n",
+        ]
+        append = parts.append
+
+        # 写入每篇论文的详细信息
+        for i, paper in enumerate(papers, 1):
+            authors = paper.get("authors", ("未知",))
+            categories = paper.get("categories", ())
+            append(
+                f"论文 {i}: {paper.get('title', '无标题')}\n"
+                f"{sep_minor}\n"
+                f"ID: {paper.get('id', 'N/A')}\n"
+                f"作者: {', '.join(authors)}\n"
+                f"发表时间: {paper.get('published', 'N/A')}\n"
+                f"更新时间: {paper.get('updated', 'N/A')}\n"
+                f"主要分类: {paper.get('primary_category', 'N/A')}\n"
+                f"所有分类: {', '.join(categories)}\n"
+                f"PDF链接: {paper.get('pdf_url', 'N/A')}\n"
+            )
+
+            if paper.get("comment"):
+                append(f"备注: {paper.get('comment', '')}\n")
+
+            append(f"摘要: {paper.get('summary', '无摘要')}\n")
+
+            # 添加链接信息
+            links = paper.get("links")
+            if links:
+                append("相关链接:\n")
+                append("".join(f"  - {link}\n" for link in links))
+
+            append(f"\n{sep_major}\n\n")
+
         with open(output_path, "w", encoding="utf-8") as f:
-            # 写入文件头
-            f.write("=" * 80 + "\n")
-            f.write("ArXiv 计算机科学论文列表\n")
-            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"论文数量: {len(papers)}\n")
-            f.write("=" * 80 + "\n\n")
-
-            # 写入每篇论文的详细信息
-            for i, paper in enumerate(papers, 1):
-                f.write(f"论文 {i}: {paper.get('title', '无标题')}\n")
-                f.write("-" * 60 + "\n")
-                f.write(f"ID: {paper.get('id', 'N/A')}\n")
-                f.write(f"作者: {', '.join(paper.get('authors', ['未知']))}\n")
-                f.write(f"发表时间: {paper.get('published', 'N/A')}\n")
-                f.write(f"更新时间: {paper.get('updated', 'N/A')}\n")
-                f.write(f"主要分类: {paper.get('primary_category', 'N/A')}\n")
-                f.write(f"所有分类: {', '.join(paper.get('categories', []))}\n")
-                f.write(f"PDF链接: {paper.get('pdf_url', 'N/A')}\n")
-
-                if paper.get("comment"):
-                    f.write(f"备注: {paper.get('comment', '')}\n")
-
-                f.write(f"摘要: {paper.get('summary', '无摘要')}\n")
-
-                # 添加链接信息
-                if paper.get("links"):
-                    f.write("相关链接:\n")
-                    for link in paper.get("links", []):
-                        f.write(f"  - {link}\n")
-
-                f.write("\n" + "=" * 80 + "\n\n")
+            f.write("".join(parts))
 
         log.info(f"论文已保存到: {output_path}")
 
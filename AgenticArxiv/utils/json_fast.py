@@ -0,0 +1,76 @@
+# AgenticArxiv/utils/json_fast.py
+"""
+JSON 序列化的统一入口：优先使用 orjson，未安装时回退到标准库 json。
+
+输出语义与 json.dumps(obj, ensure_ascii=False) 一致（紧凑格式除外），
+方便在一个地方切换 JSON 实现。另提供从 LLM 输出中截取 JSON 对象文本的 extract_json_object。
+"""
+
+import json
+import re
+from typing import Any, Optional, Union
+
+try:
+    import orjson  # pyright: ignore[reportMissingImports]
+except Exception:
+    orjson = None
+
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> str:
+        """序列化为 str，非 ASCII 字符原样输出"""
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(s: Union[str, bytes]) -> Any:
+        return orjson.loads(s)
+
+else:
+
+    def dumps(obj: Any) -> str:
+        """序列化为 str，非 ASCII 字符原样输出"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(s: Union[str, bytes]) -> Any:
+        return json.loads(s)
+
+
+# 只关心会改变括号配对状态的字符，其余字符由正则引擎在 C 层跳过
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def extract_json_object(text: str) -> Optional[str]:
+    """
+    从 LLM 输出中取出第一段完整的 {...} 文本（不解析）。
+    从第一个 { 开始按括号配对扫描（忽略字符串内的括号和转义字符），
+    配对失败时回退到贪婪匹配 {.*}。
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_str = False
+    skip = -1
+    for m in _JSON_TOKEN_RE.finditer(text, start):
+        i = m.start()
+        if i < skip:
+            continue  # 被反斜杠转义的字符
+        c = text[i]
+        if in_str:
+            if c == "\\":
+                skip = i + 2
+            elif c == '"':
+                in_str = False
+        elif c == '"':
+            in_str = True
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+
+    m = _JSON_OBJECT_RE.search(text, start)
+    return m.group(0) if m else None
@@ -1,7 +1,13 @@
 # AgenticArxiv/utils/logger.py
+import os
 import sys
 from loguru import logger
 
+# backtrace/diagnose 会在每条异常日志里展开整条调用栈和变量值，开销大且可能把敏感值写进日志；
+# 默认关闭，排查问题时设置 LOG_DIAGNOSE=1 打开
+LOG_DIAGNOSE = os.getenv("LOG_DIAGNOSE", "0") == "1"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+
 
 def setup_logger():
     """配置日志记录器"""
@@ -12,12 +18,12 @@ def setup_logger():
     logger.add(
         "./output/log.txt",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} | {message}",
-        level="DEBUG",
+        level=LOG_LEVEL,
         rotation="10 MB",  # 日志文件达到10MB时轮转
         retention="30 days",  # 保留30天的日志
         encoding="utf-8",
-        backtrace=True,  # 记录堆栈跟踪
-        diagnose=True,  # 显示变量值
+        backtrace=LOG_DIAGNOSE,  # 记录堆栈跟踪
+        diagnose=LOG_DIAGNOSE,  # 显示变量值
         mode="w"  # "w"为覆盖写入,"a"为追加写入
     )
     return logger
@@ -3,21 +3,113 @@ from __future__ import annotations
 
 import hashlib
 import os
+import queue
 import re
+import secrets
+import shutil
+import threading
 import time
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 
 _SAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 
+def _make_session() -> requests.Session:
+    """
+    模块级共享 Session：同一主机（arxiv.org）的连接放进连接池复用，省去每篇 PDF 的 TCP/TLS 握手；
+    连接失败和 502/503/504 统一在这里按退避重试
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,  # 重试用尽后返回最后的响应，由 raise_for_status 报错
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = _make_session()
+
+_NOT_PDF_ERROR = "下载结果不像有效 PDF（content 可能是 HTML/重定向页/错误页）"
+
+
+class _NotPdfError(RuntimeError):
+    """响应内容不是 PDF：已下载部分没有续传价值，直接丢弃"""
+
+# 落盘 / 计算哈希时的块大小：大块可以摊薄每块的 Python 调用开销
+_COPY_BUFSIZE = 4 * 1024 * 1024
+# 每次从网络读取的上限：比写缓冲小得多，魔数检查在头一块到达时就能进行，
+# 连接中断时丢掉的也只是正在读的这一小块
+_NET_READ_SIZE = 256 * 1024
+
+
+# 删除全部合法字符的转换表：translate 之后为空串，说明原串本来就不需要替换
+_SAFE_FILENAME_DROP = str.maketrans(
+    "", "", "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._-"
+)
+
+
 def safe_filename(name: str) -> str:
+    # 常见的 arXiv 新式 id（如 2401.12345v1）全是合法字符，一次 C 层 translate 即可判定，不走正则
+    if name.isascii() and not name.translate(_SAFE_FILENAME_DROP):
+        return name.strip("_")
     return _SAFE_FILENAME_RE.sub("_", name).strip("_")
 
 
+def stat_or_none(path: str) -> Optional[os.stat_result]:
+    """
+    一次 stat 拿到存在性和大小，代替 exists + getsize 的多次系统调用
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def hash_file(path: str) -> str:
+    """
+    计算已落盘文件的 SHA-256。Python 3.11+ 用 hashlib.file_digest（复用缓冲区、哈希时释放 GIL），
+    否则按大块读取
+    """
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        sha = hashlib.sha256()
+        for chunk in iter(lambda: f.read(_COPY_BUFSIZE), b""):
+            sha.update(chunk)
+        return sha.hexdigest()
+
+
+def hash_files(paths: List[str], max_workers: Optional[int] = None) -> List[str]:
+    """
+    批量计算 SHA-256（顺序与 paths 一致）：多个文件时用进程池分摊到多个核上；
+    单个文件直接算，不值得起进程池
+    """
+    if len(paths) <= 1:
+        return [hash_file(p) for p in paths]
+    workers = min(len(paths), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hash_file, paths))
+
+
 def normalize_arxiv_pdf_url(url: str) -> str:
     """
     arXiv 的 pdf_url 有时不带 .pdf，统一归一化为带 .pdf 的路径
@@ -32,75 +124,243 @@ def normalize_arxiv_pdf_url(url: str) -> str:
     return urlunparse(p._replace(path=path))
 
 
-def acquire_lock(lock_path: str, retries: int = 150, delay_s: float = 0.2) -> None:
+def _try_lock(fd: int) -> bool:
+    """非阻塞加锁：拿到返回 True，已被占用返回 False"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def acquire_lock(lock_path: str, timeout_s: float = 30.0, delay_s: float = 0.2) -> int:
     """
-    简单文件锁：创建 lock 文件，存在则等待一会儿重试
+    内核文件锁（类 Unix 用 fcntl.flock，Windows 用 msvcrt.locking）：进程崩溃时锁由内核自动释放。
+    非阻塞尝试加锁，被占用时重试，超过 timeout_s 仍拿不到则报错，避免调用线程被另一个长任务挂住。
+    返回锁文件 fd，交给 release_lock 释放。锁文件本身保留，不删除（删除会让等待者锁在旧 inode 上）
     """
-    for _ in range(retries):
-        try:
-            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-            os.close(fd)
-            return
-        except FileExistsError:
+    fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+    try:
+        deadline = time.monotonic() + timeout_s
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"获取文件锁失败: {lock_path}（可能有其他任务在进行）")
             time.sleep(delay_s)
-    raise RuntimeError(f"获取下载锁失败: {lock_path}（可能有其他下载在进行）")
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
 
 
-def release_lock(lock_path: str) -> None:
+def release_lock(lock_fd: int) -> None:
     try:
-        if os.path.exists(lock_path):
-            os.remove(lock_path)
-    except Exception:
+        if fcntl is not None:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(lock_fd, msvcrt.LK_UNLCK, 1)
+    except OSError:
         pass
+    finally:
+        os.close(lock_fd)
 
 
-def _looks_like_pdf(path: str) -> bool:
+def lock_is_held(lock_path: str) -> bool:
+    """
+    非阻塞探测锁是否被占用。锁文件释放后仍保留在磁盘上，
+    所以不能用“锁文件是否存在”来判断是否有任务在进行
+    """
     try:
-        with open(path, "rb") as f:
-            head = f.read(5)
-        return head.startswith(b"%PDF")
-    except Exception:
+        fd = os.open(lock_path, os.O_RDWR)
+    except OSError:
         return False
+    try:
+        if not _try_lock(fd):
+            return True
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return False
+    finally:
+        os.close(fd)
+
+
+def _preallocate(f, content_length: Optional[str]) -> None:
+    """
+    已知 Content-Length 时从当前位置起预分配磁盘空间，让文件系统尽量连续分配；
+    不支持的平台/文件系统直接跳过。会改变文件长度，写完后需要按实际位置 truncate
+    """
+    if not content_length or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        n = int(content_length)
+        if n > 0:
+            os.posix_fallocate(f.fileno(), f.tell(), n)
+    except (ValueError, OSError):
+        pass
+
+
+class _HashingReader:
+    """
+    包一层响应流：copyfileobj 每读出一块就交给后台线程更新 SHA-256，并统计字节数。
+    同时记下开头 5 个字节，一旦不是 PDF 魔数立即报错，不必等整个响应（常见是 HTML 错误页）传完。
+    hashlib 对大块数据计算时会释放 GIL，哈希与网络读取、写盘并行进行，
+    下载和哈希一次完成，不必落盘后再读一遍。用完必须 close()（hexdigest 会自动 close）
+    """
+
+    def __init__(self, raw):
+        self._raw = raw
+        # urllib3 2.x 的 read(n) 会一直读到凑满 n 字节，中途断线时整块作废；
+        # read1 有多少返回多少，已到达的数据都能落盘供续传。旧版 urllib3 没有 read1，退回 read
+        self._read = getattr(raw, "read1", raw.read)
+        self._sha = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        # 有界队列：哈希跟不上时反压读取，避免把整个文件堆在内存里
+        self._queue: queue.Queue[Optional[bytes]] = queue.Queue(maxsize=4)
+        self._worker = threading.Thread(target=self._hash_loop, daemon=True)
+        self._worker.start()
+
+    def _hash_loop(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            self._sha.update(chunk)
+
+    def _take(self, chunk: bytes) -> None:
+        if len(self.head) < 5:
+            self.head += chunk[: 5 - len(self.head)]
+            if len(self.head) == 5 and not self.head.startswith(b"%PDF"):
+                raise _NotPdfError(_NOT_PDF_ERROR)
+        self._queue.put(chunk)
+        self.size += len(chunk)
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._read(n)
+        if chunk:
+            self._take(chunk)
+        return chunk
+
+    def prime(self, f) -> None:
+        """续传：先把文件里已下载的部分送进哈希并计入字节数，之后再接着读网络流"""
+        for chunk in iter(lambda: f.read(_COPY_BUFSIZE), b""):
+            self._take(chunk)
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+
+    def hexdigest(self) -> str:
+        self.close()
+        return self._sha.hexdigest()
+
+
+def _resume_validator(headers) -> Optional[str]:
+    """If-Range 用的校验值：强 ETag 优先，其次 Last-Modified（弱 ETag 不能用于 If-Range）"""
+    etag = headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified")
+
+
+def _is_range_not_satisfiable(e: BaseException) -> bool:
+    resp = getattr(e, "response", None)
+    return isinstance(e, requests.HTTPError) and resp is not None and resp.status_code == 416
 
 
 def download_pdf(url: str, dest_path: str, timeout: Tuple[int, int] = (10, 120)) -> Tuple[int, str]:
     """
-    下载 PDF 到 dest_path，使用 .part 临时文件，完成后原子替换
+    下载 PDF 到 dest_path，使用同目录下的随机 .part 临时文件，完成后原子替换。
+    并发下载同一篇论文时各写各的临时文件，最后一次 replace 生效，读者看不到半截文件，无需加锁
+    传输中断时已下载部分留在 dest_path + ".part"（校验值 ETag/Last-Modified 存在 .part.meta），
+    下次调用用 HTTP Range + If-Range 续传；服务器上的文件变了会返回完整内容，从头下载
     返回 (size_bytes, sha256_hex)
     """
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
-    tmp_path = dest_path + ".part"
-    if os.path.exists(tmp_path):
-        # 避免上次异常残留
+    resume_path = dest_path + ".part"
+    meta_path = resume_path + ".meta"
+    tmp_path = f"{dest_path}.{os.getpid()}.{secrets.token_hex(4)}.part"
+
+    # 认领上次中断留下的半截文件；replace 是原子的，并发时只有一个下载能拿到
+    start = 0
+    validator: Optional[str] = None
+    try:
+        os.replace(resume_path, tmp_path)
+    except OSError:
+        pass
+    else:
         try:
-            os.remove(tmp_path)
-        except Exception:
+            with open(meta_path, encoding="utf-8") as mf:
+                validator = mf.read().strip() or None
+            os.remove(meta_path)
+        except OSError:
             pass
-
-    sha = hashlib.sha256()
-    size = 0
+        # 没有校验值就无法确认服务器上的文件没变，不续传（下面会以 w+b 从头写）
+        if validator:
+            start = os.path.getsize(tmp_path)
 
     headers = {"User-Agent": "AgenticArxiv/0.1 (+pdf downloader)"}
-    with requests.get(url, stream=True, allow_redirects=True, headers=headers, timeout=timeout) as r:
-        r.raise_for_status()
-
-        with open(tmp_path, "wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 1024):
-                if not chunk:
-                    continue
-                f.write(chunk)
-                sha.update(chunk)
-                size += len(chunk)
-
-    # 基础校验：PDF 魔数
-    if size < 1024 or not _looks_like_pdf(tmp_path):
-        # 保留 part 便于排查？这里直接删掉避免污染
+    if start:
+        headers["Range"] = f"bytes={start}-"
+        headers["If-Range"] = validator
+
+    try:
+        with _SESSION.get(url, stream=True, allow_redirects=True, headers=headers, timeout=timeout) as r:
+            r.raise_for_status()
+            # 只有 206 且起点对得上才追加；200 等情况说明服务器返回了完整内容，从头写
+            if not (
+                start
+                and r.status_code == 206
+                and r.headers.get("Content-Range", "").startswith(f"bytes {start}-")
+            ):
+                start = 0
+            # 记下本次内容的校验值，中断时随半截文件一起保存；续传的 206 未带时沿用原值
+            validator = _resume_validator(r.headers) or (validator if start else None)
+
+            # 直接从底层流按大块拷贝到文件；decode_content 保证与 iter_content 一样处理 gzip 等编码
+            r.raw.decode_content = True
+            reader = _HashingReader(r.raw)
+            try:
+                # 网络按小块读，文件写缓冲仍取大块，攒满再落一次 write 系统调用
+                with open(tmp_path, "r+b" if start else "w+b", buffering=_COPY_BUFSIZE) as f:
+                    if start:
+                        # 哈希状态没法跨进程保留：已有部分先过一遍哈希，读完正好停在文件末尾
+                        reader.prime(f)
+                    _preallocate(f, r.headers.get("Content-Length"))
+                    try:
+                        shutil.copyfileobj(reader, f, _NET_READ_SIZE)
+                    finally:
+                        # 去掉预分配多出的部分；中断时也要截断，续传靠文件长度确定起点
+                        f.truncate(f.tell())
+            finally:
+                reader.close()
+            size = reader.size
+
+        # 魔数在读流时已经检查过；这里兜底过短的响应
+        if size < 1024 or not reader.head.startswith(b"%PDF"):
+            raise _NotPdfError(_NOT_PDF_ERROR)
+
+        os.replace(tmp_path, dest_path)
+    except BaseException as e:
+        # 网络/HTTP 失败（包括续传请求还没开始传就失败）：已下载部分连同校验值挪回固定的 .part，供下次续传；
+        # 内容不是 PDF、Range 不可满足或没有校验值时直接删掉，随机文件名不会再被复用或清理
+        discard = isinstance(e, _NotPdfError) or _is_range_not_satisfiable(e)
         try:
-            os.remove(tmp_path)
-        except Exception:
+            if not discard and validator and os.path.getsize(tmp_path) > 0:
+                with open(meta_path, "w", encoding="utf-8") as mf:
+                    mf.write(validator)
+                os.replace(tmp_path, resume_path)
+            else:
+                os.remove(tmp_path)
+        except OSError:
             pass
-        raise RuntimeError("下载结果不像有效 PDF（content 可能是 HTML/重定向页/错误页）")
-
-    os.replace(tmp_path, dest_path)
-    return size, sha.hexdigest()
+        raise
+    return size, reader.hexdigest()
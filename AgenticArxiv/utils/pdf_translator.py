@@ -5,7 +5,9 @@ import os
 import re
 import shutil
 import subprocess
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Tuple, Callable, Dict, Any
 
 from utils.logger import log
@@ -31,15 +33,29 @@ def _guess_outputs(out_dir: str, stem: str) -> Tuple[str, str]:
     return mono, dual
 
 
-_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]")
-_TQDM_PERCENT_RE = re.compile(r"(\d{1,3})%\|")  # tqdm 典型： 12%|████...
-_PLAIN_PERCENT_RE = re.compile(r"(?<!\d)(\d{1,3})%(?!\d)")
-_PAGE_RE = re.compile(r"(?i)\bpage(?:s)?\b.*?(\d+)\s*/\s*(\d+)")
+@lru_cache(maxsize=16)
+def _which(name: str, path_env: Optional[str]) -> Optional[str]:
+    """shutil.which 的缓存版；PATH 作为缓存键的一部分，PATH 变化后会重新查找"""
+    return shutil.which(name, path=path_env)
+
+
+# 进度相关的模式都是纯 ASCII，直接在子进程输出的原始 bytes 上匹配，省去逐行 UTF-8 解码
+_ANSI_RE = re.compile(rb"\x1b\[[0-9;]*[a-zA-Z]")
+# 两种百分比共用一次扫描：带 | 的是 tqdm 百分比（12%|███），其余按普通百分比的边界规则判定。
+# 数字% 片段互不重叠，finditer 依次给出的就是各自最左的匹配，与分别 search 的结果一致
+_PERCENT_RE = re.compile(rb"(\d{1,3})%(\|)?")
+# page / 分数会跨越中间的文字，只在百分比都没给出有效进度时才单独搜索，避免吞掉前面的百分比
+_PAGE_RE = re.compile(rb"(?i)\bpages?\b.*?(\d+)\s*/\s*(\d+)")
 # 排除日期格式 [04/04/26]：(?<!\[) 拒绝 [ 开头，(?!/) 拒绝后续还有 /
-_FRACTION_RE = re.compile(r"(?<!\[)(?<!\d)(\d+)\s*/\s*(\d+)(?!\d)(?!/)")
+_FRACTION_RE = re.compile(rb"(?<!\[)(?<!\d)(\d+)\s*/\s*(\d+)(?!\d)(?!/)")
+# 每条 tqdm 刷新都会走到这里，预先绑定方法，省去每次的属性查找
+_ansi_sub = _ANSI_RE.sub
+_percent_finditer = _PERCENT_RE.finditer
+_page_search = _PAGE_RE.search
+_fraction_search = _FRACTION_RE.search
 
 
-def _extract_progress(text: str) -> Optional[float]:
+def _extract_progress(text: bytes) -> Optional[float]:
     """
     从一段输出里尽量提取 0~1 的进度。
     优先：
@@ -51,148 +67,86 @@ def _extract_progress(text: str) -> Optional[float]:
     """
     if not text:
         return None
-    text = _ANSI_RE.sub("", text)
+    # 四种格式都离不开 % 或 /：两次 C 层子串查找就能筛掉大部分纯文本日志行
+    if b"%" not in text and b"/" not in text:
+        return None
+    text = _ansi_sub(b"", text)
     # 跳过非进度行：只处理 strip 后以数字开头的行（tqdm 输出格式）
     stripped = text.strip()
-    if not stripped or not stripped[0].isdigit():
+    if not stripped[:1].isdigit():
         return None
 
-    m = _TQDM_PERCENT_RE.search(text)
-    if m:
-        v = int(m.group(1))
-        if 0 <= v <= 100:
-            return v / 100.0
-
-    m = _PLAIN_PERCENT_RE.search(text)
+    # 只看第一个 tqdm 百分比和第一个普通百分比；命中有效的 tqdm 百分比即可提前返回
+    tqdm_seen = False
+    pct_v: Optional[int] = None
+    for m in _percent_finditer(text):
+        if m[2] and not tqdm_seen:
+            tqdm_seen = True
+            v = int(m[1])
+            if v <= 100:
+                return v / 100.0
+        if pct_v is None:
+            # 普通百分比要求前后都不紧挨数字
+            b, e = m.start(), m.end(1) + 1
+            if not text[b - 1 : b].isdigit() and not text[e : e + 1].isdigit():
+                pct_v = int(m[1])
+        if tqdm_seen and pct_v is not None:
+            break
+
+    if pct_v is not None and pct_v <= 100:
+        return pct_v / 100.0
+
+    m = _page_search(text)
     if m:
-        v = int(m.group(1))
-        if 0 <= v <= 100:
-            return v / 100.0
-
-    m = _PAGE_RE.search(text)
-    if m:
-        i = int(m.group(1))
-        n = int(m.group(2))
+        i = int(m[1])
+        n = int(m[2])
         if n > 0:
             return max(0.0, min(1.0, i / n))
 
-    m = _FRACTION_RE.search(text)
+    m = _fraction_search(text)
     if m:
-        i = int(m.group(1))
-        n = int(m.group(2))
+        i = int(m[1])
+        n = int(m[2])
         if n > 1 and i <= n:
             return max(0.0, min(1.0, i / n))
 
     return None
 
 
-def _run_with_pty(
-    cmd: list[str],
-    on_text: Callable[[str], None],
-) -> int:
-    """
-    用伪终端跑子进程，能捕获 tqdm 使用 \\r 刷新的进度。
-    仅适用于类 Unix（Linux/macOS）。
-    返回子进程 returncode。
-    """
-    import pty
-    import select
-
-    master_fd, slave_fd = pty.openpty()
-    try:
-        proc = subprocess.Popen(
-            cmd,
-            stdout=slave_fd,
-            stderr=slave_fd,
-            stdin=subprocess.DEVNULL,
-            close_fds=True,
-        )
-    finally:
-        try:
-            os.close(slave_fd)
-        except Exception:
-            pass
-
-    buf = b""
-    try:
-        while True:
-            # 读输出（支持 \r / \n 分割）
-            r, _, _ = select.select([master_fd], [], [], 0.2)
-            if master_fd in r:
-                try:
-                    data = os.read(master_fd, 4096)
-                except OSError:
-                    data = b""
-
-                if not data:
-                    # 可能 EOF
-                    if proc.poll() is not None:
-                        break
-                else:
-                    buf += data
-                    while True:
-                        # 找到最早的 \r 或 \n
-                        idx_r = buf.find(b"\r")
-                        idx_n = buf.find(b"\n")
-                        idxs = [i for i in [idx_r, idx_n] if i != -1]
-                        if not idxs:
-                            break
-                        idx = min(idxs)
-                        chunk = buf[:idx]
-                        buf = buf[idx + 1 :]
-                        if chunk:
-                            on_text(chunk.decode("utf-8", errors="ignore"))
-                        else:
-                            on_text("")  # 空刷新也触发一次（可用于心跳/阶段判断）
-
-            # 若进程结束，尽量把残余读完
-            if proc.poll() is not None:
-                # 再尝试快速 drain 一下
-                for _ in range(5):
-                    r2, _, _ = select.select([master_fd], [], [], 0.05)
-                    if master_fd in r2:
-                        try:
-                            data2 = os.read(master_fd, 4096)
-                        except OSError:
-                            data2 = b""
-                        if not data2:
-                            break
-                        buf += data2
-                    else:
-                        break
-                break
-
-        if buf:
-            on_text(buf.decode("utf-8", errors="ignore"))
-
-        return int(proc.wait())
-    finally:
-        try:
-            os.close(master_fd)
-        except Exception:
-            pass
-
-
 def _run_with_pipe(
     cmd: list[str],
-    on_text: Callable[[str], None],
+    on_text: Callable[[bytes], None],
+    env: Optional[Dict[str, str]] = None,
 ) -> int:
     """
-    Windows/无 pty 环境的 fallback：PIPE 行读取。
-    注意：若 tqdm 只用 \\r 不输出 \\n，这里更新会少一些（但通常也会打印阶段行）。
+    PIPE 读取子进程输出，按 \r / \n 切行回调（tqdm 用 \r 刷新的进度也能逐条拿到）。
+    返回子进程 returncode。
     """
     proc = subprocess.Popen(
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         stdin=subprocess.DEVNULL,
-        text=True,
-        bufsize=1,
-        universal_newlines=True,
+        env=env,
     )
     assert proc.stdout is not None
-    for line in proc.stdout:
-        on_text(line.rstrip("\n"))
+
+    buf = b""
+    # read1 有数据就返回，不会等满 64 KiB；切行交给 C 层的 splitlines，末尾不完整的一行留到下次
+    while True:
+        data = proc.stdout.read1(65536)
+        if not data:
+            break
+        lines = (buf + data).splitlines(keepends=True)
+        if lines and not lines[-1].endswith((b"\r", b"\n")):
+            buf = lines.pop()
+        else:
+            buf = b""
+        for ln in lines:
+            on_text(ln.rstrip(b"\r\n"))
+
+    if buf:
+        on_text(buf)
     return int(proc.wait())
 
 
@@ -212,14 +166,17 @@ def run_pdf2zh_translate(
       pdf2zh input.pdf -s bing -o out_dir -t 4
 
     关键改造：
-    - 用 Popen 实时读取 stdout（Linux 用 pty 捕获 tqdm 的 \\r 刷新）
+    - 用 Popen 实时读取 stdout（PIPE 读取，按 \\r / \\n 切行捕获 tqdm 的刷新）
     - 解析 stdout 中的百分比/页码，并通过 progress_cb 推送
     """
     if not os.path.exists(input_pdf):
         raise FileNotFoundError(f"input pdf not found: {input_pdf}")
 
-    bin_path = shutil.which(pdf2zh_bin) or pdf2zh_bin
-    if shutil.which(bin_path) is None and not os.path.exists(bin_path):
+    resolved = _which(pdf2zh_bin, os.environ.get("PATH"))
+    bin_path = resolved or pdf2zh_bin
+    if resolved is None and not os.path.exists(bin_path):
+        # 未找到的结果不留在缓存里，装好 pdf2zh 后不用重启进程
+        _which.cache_clear()
         raise RuntimeError(
             f"未找到 pdf2zh 可执行文件：{pdf2zh_bin}。"
             f"请先安装：pip install pdf2zh，或设置环境变量 PDF2ZH_BIN 指向可执行文件。"
@@ -240,42 +197,50 @@ def run_pdf2zh_translate(
         str(int(threads)),
     ]
 
-    log.info(f"Run pdf2zh: {' '.join(cmd)}")
+    log.opt(lazy=True).info("Run pdf2zh: {}", lambda: " ".join(cmd))
 
     stdout_file = None
     if log_path:
         os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        stdout_file = open(log_path, "w", encoding="utf-8")
+        # 子进程输出原样写入（本身就是 UTF-8），不做解码
+        stdout_file = open(log_path, "wb")
 
-    # 用于错误信息（保留末尾若干行）
-    tail: list[str] = []
-    tail_max = 80
+    # 用于错误信息（保留末尾若干行，出错时才解码）
+    tail: deque[bytes] = deque(maxlen=80)
 
     last_p: Optional[float] = None
+    # 上一次解析出进度的行里的百分比片段（% 及其前 3 个字节）；
+    # tqdm 以很高频率重复刷新同一个百分比，片段没变就不必再跑正则
+    last_pct_token: Optional[bytes] = None
 
-    def on_text(text: str) -> None:
-        nonlocal last_p, tail
+    def on_text(text: bytes) -> None:
+        nonlocal last_p, last_pct_token
 
         if stdout_file:
             # tqdm 的 \r 刷新也写成一行，方便复盘（不影响）
-            stdout_file.write(text + "\n")
+            stdout_file.write(text + b"\n")
             stdout_file.flush()
 
         if text:
             tail.append(text)
-            if len(tail) > tail_max:
-                tail = tail[-tail_max:]
+
+        i = text.find(b"%")
+        pct_token = text[max(0, i - 3) : i + 1] if i >= 0 else None
+        if pct_token is not None and pct_token == last_pct_token:
+            return
 
         p = _extract_progress(text)
         if p is None:
             return
+        last_pct_token = pct_token
 
         # 进度必须单调不减（避免 tqdm 反复刷同一个百分比）
         if last_p is None or p > last_p:
             last_p = p
             if progress_cb:
                 try:
-                    progress_cb(float(p), {"stage": "pdf2zh", "line": text})
+                    line = text.decode("utf-8", errors="ignore")
+                    progress_cb(float(p), {"stage": "pdf2zh", "line": line})
                 except Exception:
                     pass
 
@@ -286,14 +251,20 @@ def run_pdf2zh_translate(
             except Exception:
                 pass
 
-        # Linux 优先用 pty
-        if os.name != "nt":
-            rc = _run_with_pty(cmd, on_text=on_text)
-        else:
-            rc = _run_with_pipe(cmd, on_text=on_text)
+        # 不再借助 pty：关闭子进程的输出缓冲，tqdm 照常用 \r 刷新，PIPE 上即可实时读到
+        env = {
+            **os.environ,
+            "PYTHONUNBUFFERED": "1",
+            "TQDM_MININTERVAL": "0.5",
+            "COLUMNS": "200",
+        }
+        rc = _run_with_pipe(cmd, on_text=on_text, env=env)
 
         if rc != 0:
-            tail_text = "\n".join(tail[-40:]) if tail else "(no output captured)"
+            tail_text = (
+                b"\n".join(list(tail)[-40:]).decode("utf-8", errors="ignore")
+                if tail else "(no output captured)"
+            )
             raise RuntimeError(f"pdf2zh exited with code={rc}\n---- tail ----\n{tail_text}")
 
     finally: